@@ -20,6 +20,12 @@ import subprocess
 import shutil
 from pathlib import Path
 
+# 不能用 UPX 压缩的 Qt 动态库
+QT_UPX_EXCLUDE = [
+    "Qt6Core.dll", "Qt6Gui.dll", "Qt6Widgets.dll", "Qt6Network.dll",
+    "Qt6Multimedia.dll", "qwindows.dll",
+]
+
 def install_pyinstaller():
     """安装 PyInstaller"""
     print("正在安装 PyInstaller...")
@@ -60,10 +66,9 @@ def build():
         "--clean",     # 清理临时文件
         "--noconfirm", # 不确认覆盖
         # 隐藏导入
-        "--hidden-import", "pilk",
-        "--hidden-import", "pilk._pilk",
-        "--hidden-import", "pilk.SilkDecoder",
-        "--hidden-import", "pilk.SilkEncoder",
+        "--hidden-import", "pysilk",
+        "--hidden-import", "pysilk.backends.cython",
+        "--hidden-import", "pysilk.backends.cython._silk",
         "--hidden-import", "pydub",
         "--hidden-import", "pydub.utils",
         "--hidden-import", "pydub.audio_segment",
@@ -72,8 +77,13 @@ def build():
         "--hidden-import", "PyQt6.QtGui",
         "--hidden-import", "PyQt6.QtWidgets",
         "--hidden-import", "PyQt6.QtMultimedia",
-        # 收集所有 pilk 包的数据
-        "--collect-all", "pilk",
+        # 只收集 pysilk 的二进制扩展和子模块，跳过数据文件扫描
+        "--collect-binaries", "pysilk",
+        "--collect-submodules", "pysilk",
+        # 排除未使用的 Qt 模块，减小体积并加快启动
+        "--exclude-module", "PyQt6.QtQml",
+        "--exclude-module", "PyQt6.QtQuick",
+        "--exclude-module", "PyQt6.QtWebEngineCore",
     ]
 
     # 添加 ffmpeg 到打包
@@ -106,13 +116,27 @@ def build():
         if icon_path.exists():
             args.extend(["--icon", str(icon_path)])
 
+        # 有 UPX 时压缩体积，但 Qt 的 DLL 压缩后会破坏签名，需要排除
+        upx_path = shutil.which("upx")
+        if upx_path:
+            args.extend(["--upx-dir", os.path.dirname(upx_path)])
+            for dll in QT_UPX_EXCLUDE:
+                args.extend(["--upx-exclude", dll])
+
     args.append(main_script)
 
     print(f"执行命令: {' '.join(args)}")
     print("-" * 50)
 
+    # 每个系统/架构使用独立的缓存目录，多个平台可以同时打包
+    env = os.environ.copy()
+    env.setdefault(
+        "PYINSTALLER_CONFIG_DIR",
+        str(Path("build").absolute() / f"pyinstaller-{system}-{platform.machine()}".lower()),
+    )
+
     # 执行打包
-    result = subprocess.run(args)
+    result = subprocess.run(args, env=env)
 
     if result.returncode == 0:
         print("-" * 50)
@@ -3,70 +3,285 @@
 将 plist 文件中的 SILK 音频数据转换为 MP3/WAV 文件
 
 使用方法:
-    python convert_plist_to_audio.py <plist文件路径> [输出目录] [格式]
+    python convert_plist_to_audio.py <plist文件路径> [输出目录] [格式] [--force]
+
+    默认跳过输出目录中已存在的文件，加 --force 强制重新转换
 
 依赖安装:
-    pip install pilk pydub
+    pip install silk-python
 
-注意: pydub 需要 ffmpeg，请确保系统已安装 ffmpeg:
+注意: 转换 MP3 需要 ffmpeg，请确保系统已安装 ffmpeg:
     macOS: brew install ffmpeg
     Ubuntu: sudo apt install ffmpeg
 """
 
 import plistlib
-import base64
+import binascii
+import functools
+import io
+import mmap
 import os
 import sys
-import re
+import struct
+import subprocess
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
+from xml.etree import ElementTree
+
+try:
+    import pysilk
+    _PYSILK_IMPORT_ERROR = None
+except ImportError as e:
+    pysilk = None
+    _PYSILK_IMPORT_ERROR = e
+
+_SILK_MAGIC = b'\x02#!SILK_V3'
+
+# 文件名中的非法字符，用 str.translate 一次性删除
+_ILLEGAL_TT = str.maketrans('', '', '<>:"/\\|?*')
+
+# 同时运行的 ffmpeg 进程上限
+_FFMPEG_SLOTS = threading.Semaphore(os.cpu_count() or 1)
 
 def sanitize_filename(name: str, max_length: int = 50) -> str:
     """清理文件名，移除非法字符"""
-    name = re.sub(r'[<>:"/\\|?*]', '', name)
+    name = name.translate(_ILLEGAL_TT)
     if len(name) > max_length:
         name = name[:max_length]
     return name.strip() or "unnamed"
 
+def _write_wav(path: str, pcm_bytes: bytes, sample_rate: int = 24000):
+    """为 16-bit 单声道 PCM 加上 WAV 头后写入文件"""
+    with wave.open(path, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm_bytes)
+
 def convert_silk_to_audio(silk_data: bytes, output_path: str, output_format: str = "mp3"):
     """将 SILK 数据转换为音频文件"""
-    try:
-        import pilk
-        from pydub import AudioSegment
-        import tempfile
-
-        with tempfile.NamedTemporaryFile(suffix='.silk', delete=False) as silk_file:
-            silk_file.write(silk_data)
-            silk_path = silk_file.name
+    if pysilk is None:
+        return False, f"缺少依赖: {_PYSILK_IMPORT_ERROR}. 请运行: pip install silk-python"
 
-        with tempfile.NamedTemporaryFile(suffix='.pcm', delete=False) as pcm_file:
-            pcm_path = pcm_file.name
+    try:
+        # 全程在内存中解码，不再写临时文件
+        silk_io = io.BytesIO(silk_data)
+        pcm_io = io.BytesIO()
+        pysilk.decode(silk_io, pcm_io, 24000)
+        pcm_bytes = pcm_io.getvalue()
+        # 16-bit 单声道，每秒 48000 字节
+        duration = len(pcm_bytes) / 48.0
 
-        try:
-            duration = pilk.decode(silk_path, pcm_path)
-            audio = AudioSegment.from_raw(
-                pcm_path,
-                sample_width=2,
-                frame_rate=24000,
-                channels=1
-            )
-            audio.export(output_path, format=output_format)
+        # WAV 只需加上文件头，不必启动 ffmpeg
+        if output_format == "wav":
+            _write_wav(output_path, pcm_bytes)
             return True, duration
-        finally:
-            os.unlink(silk_path)
-            os.unlink(pcm_path)
 
-    except ImportError as e:
-        return False, f"缺少依赖: {e}. 请运行: pip install pilk pydub"
+        # 直接调用 ffmpeg 编码 PCM (16-bit, 24kHz, mono)，不经过 pydub
+        cmd = [
+            'ffmpeg', '-y', '-loglevel', 'error',
+            '-f', 's16le', '-ar', '24000', '-ac', '1', '-i', 'pipe:0',
+            '-f', output_format, output_path
+        ]
+        result = subprocess.run(cmd, input=pcm_bytes, capture_output=True)
+        if result.returncode != 0:
+            return False, f"ffmpeg 错误: {result.stderr.decode(errors='replace').strip()}"
+        return True, duration
+
+    except FileNotFoundError:
+        return False, "未找到 ffmpeg，请确保已安装并添加到 PATH"
     except Exception as e:
         return False, str(e)
 
-def save_silk_raw(silk_data: bytes, output_path: str):
+def save_silk_raw(silk_data: bytes, output_path: Path):
     """直接保存原始 SILK 文件"""
-    with open(output_path, 'wb') as f:
-        f.write(silk_data)
+    # 用底层文件描述符写入，省去缓冲文件对象的开销
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(output_path, flags, 0o644)
+    try:
+        view = memoryview(silk_data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
     return True
 
-def convert_plist_to_audio(plist_path: str, output_dir: str = None, output_format: str = "mp3"):
+def _stream_xml_plist(fp):
+    """逐个产出 XML plist 顶层字典的条目，已处理的元素随即清理"""
+    depth = 0
+    top_dict = None
+    key = None
+    for event, elem in ElementTree.iterparse(fp, events=('start', 'end')):
+        if event == 'start':
+            depth += 1
+            if depth == 2:
+                top_dict = elem
+            continue
+
+        depth -= 1
+        if depth != 2 or top_dict is None or top_dict.tag != 'dict':
+            continue
+
+        if elem.tag == 'key':
+            key = elem.text or ''
+        elif key is not None:
+            text = elem.text or ''
+            yield key, binascii.a2b_base64(text) if elem.tag == 'data' else text
+            key = None
+            # 丢弃已产出的条目，避免整棵树留在内存中
+            top_dict.clear()
+
+def _stream_binary_plist(fp):
+    """逐个产出二进制 plist 顶层字典的条目，按需从文件读取每个对象"""
+    fp.seek(0, os.SEEK_END)
+    file_size = fp.tell()
+    fp.seek(-32, os.SEEK_END)
+    offset_size, ref_size, num_objects, top_object, offset_table_offset = struct.unpack(
+        '>6xBBQQQ', fp.read(32))
+
+    fp.seek(offset_table_offset)
+    table = fp.read(offset_size * num_objects)
+    offsets = [int.from_bytes(table[i:i + offset_size], 'big')
+               for i in range(0, len(table), offset_size)]
+
+    def read_header(ref):
+        fp.seek(offsets[ref])
+        token = fp.read(1)[0]
+        kind, size = token & 0xF0, token & 0x0F
+        if size == 0x0F:
+            int_size = 1 << (fp.read(1)[0] & 0x03)
+            size = int.from_bytes(fp.read(int_size), 'big')
+        # 声明的长度超出文件范围时直接报错，不按声明长度分配内存
+        if fp.tell() + size > file_size:
+            raise plistlib.InvalidFileException()
+        return kind, size
+
+    def read_object(ref):
+        kind, size = read_header(ref)
+        if kind == 0x40:  # data
+            return fp.read(size)
+        if kind == 0x50:  # ASCII string
+            return fp.read(size).decode('ascii')
+        if kind == 0x60:  # UTF-16 string
+            return fp.read(size * 2).decode('utf-16be')
+        return None
+
+    kind, count = read_header(top_object)
+    if kind != 0xD0:  # 顶层必须是字典
+        raise plistlib.InvalidFileException()
+
+    data = fp.read(2 * count * ref_size)
+    refs = [int.from_bytes(data[i:i + ref_size], 'big')
+            for i in range(0, len(data), ref_size)]
+    for key_ref, value_ref in zip(refs[:count], refs[count:]):
+        yield read_object(key_ref), read_object(value_ref)
+
+def stream_plist(plist_path: Path):
+    """逐个产出 plist 中的 (名称, 数据)，不必先把整个字典读入内存"""
+    with open(plist_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise plistlib.InvalidFileException()
+
+        # 内存映射文件，由内核按需换页，避免再经过一层读缓冲
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:8] == b'bplist00':
+                yield from _stream_binary_plist(mm)
+            else:
+                # XML 从头到尾顺序解析，提示内核预读
+                if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                yield from _stream_xml_plist(mm)
+
+def _is_silk(value) -> bool:
+    """判断条目是否为 SILK 数据，base64 字符串只解码开头 16 个字符 (12 字节)"""
+    if isinstance(value, bytes):
+        # <data> 条目已是原始数据
+        return value.startswith(_SILK_MAGIC)
+    if not isinstance(value, str):
+        return False
+    try:
+        head = binascii.a2b_base64(value.lstrip()[:16])
+    except ValueError:
+        return False
+    return head.startswith(_SILK_MAGIC)
+
+def _payload(value) -> bytes:
+    """取条目的原始数据：<data> 条目直接返回，旧格式的 base64 字符串解码"""
+    if isinstance(value, bytes):
+        return value
+    return binascii.a2b_base64(value)
+
+def _exists(output_path: Path) -> bool:
+    """输出文件已存在且非空时视为已转换"""
+    try:
+        return output_path.stat().st_size > 0
+    except OSError:
+        return False
+
+def _part_path(output_path: Path) -> Path:
+    """写入中的临时文件；中断或失败时不会留下会被当作已转换的残缺文件"""
+    return output_path.with_suffix(output_path.suffix + '.part')
+
+def _discard(path: Path):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+def _process_silk(idx: int, safe_name: str, value, output_path: Path, force: bool = False):
+    """保存单个条目的原始 SILK 数据，返回 (是否成功, 序号, 文件名, 提示信息, 时长)"""
+    try:
+        if not force and _exists(output_path):
+            return True, idx, safe_name, f"- 已存在: {safe_name}.silk", None
+
+        if not _is_silk(value):
+            return False, idx, safe_name, f"跳过 '{safe_name}' - 不是 SILK 格式", None
+
+        part_path = _part_path(output_path)
+        try:
+            save_silk_raw(_payload(value), part_path)
+            os.replace(part_path, output_path)
+        except BaseException:
+            _discard(part_path)
+            raise
+        return True, idx, safe_name, f"✓ 已保存: {safe_name}.silk", None
+
+    except Exception as e:
+        return False, idx, safe_name, f"✗ 处理失败 '{safe_name}': {e}", None
+
+def _process_audio(idx: int, safe_name: str, value, output_path: Path, fmt: str,
+                   force: bool = False):
+    """将单个条目转换为 fmt 格式，返回 (是否成功, 序号, 文件名, 提示信息, 时长)"""
+    try:
+        if not force and _exists(output_path):
+            return True, idx, safe_name, f"- 已存在: {safe_name}.{fmt}", None
+
+        if not _is_silk(value):
+            return False, idx, safe_name, f"跳过 '{safe_name}' - 不是 SILK 格式", None
+
+        audio_data = _payload(value)
+
+        part_path = _part_path(output_path)
+        try:
+            with _FFMPEG_SLOTS:
+                success, result = convert_silk_to_audio(audio_data, str(part_path), fmt)
+            if success:
+                os.replace(part_path, output_path)
+        except BaseException:
+            _discard(part_path)
+            raise
+        if success:
+            return True, idx, safe_name, f"✓ 已转换: {safe_name}.{fmt} (时长: {result:.1f}ms)", result
+        _discard(part_path)
+        return False, idx, safe_name, f"✗ 转换失败 '{safe_name}': {result}", None
+
+    except Exception as e:
+        return False, idx, safe_name, f"✗ 处理失败 '{safe_name}': {e}", None
+
+def convert_plist_to_audio(plist_path: str, output_dir: str = None, output_format: str = "mp3",
+                           force: bool = False):
     """将 plist 文件中的音频数据转换为音频文件"""
     plist_path = Path(plist_path)
 
@@ -82,10 +297,6 @@ def convert_plist_to_audio(plist_path: str, output_dir: str = None, output_forma
     output_dir.mkdir(parents=True, exist_ok=True)
 
     print(f"正在读取: {plist_path}")
-    with open(plist_path, 'rb') as f:
-        plist_data = plistlib.load(f)
-
-    print(f"找到 {len(plist_data)} 个音频条目")
     print(f"输出目录: {output_dir}")
     print(f"输出格式: {output_format}")
     print("-" * 50)
@@ -93,36 +304,52 @@ def convert_plist_to_audio(plist_path: str, output_dir: str = None, output_forma
     success_count = 0
     fail_count = 0
 
-    for idx, (name, base64_data) in enumerate(plist_data.items(), 1):
-        safe_name = sanitize_filename(name)
-
-        try:
-            audio_data = base64.b64decode(base64_data)
-
-            if not audio_data.startswith(b'\x02#!SILK_V3'):
-                print(f"[{idx}] 跳过 '{safe_name}' - 不是 SILK 格式")
-                fail_count += 1
-                continue
+    lines = []
 
-            if output_format == "silk":
-                output_path = output_dir / f"{safe_name}.silk"
-                save_silk_raw(audio_data, str(output_path))
-                print(f"[{idx}] ✓ 已保存: {safe_name}.silk")
+    # 只在主线程输出，避免多线程打印交错；每 32 条合并写一次
+    def report(futures, flush=False):
+        nonlocal success_count, fail_count
+        for future in futures:
+            ok, idx, safe_name, msg, duration = future.result()
+            lines.append(f"[{idx}] {msg}\n")
+            if ok:
                 success_count += 1
             else:
-                output_path = output_dir / f"{safe_name}.{output_format}"
-                success, result = convert_silk_to_audio(audio_data, str(output_path), output_format)
+                fail_count += 1
+        if lines and (flush or len(lines) >= 32):
+            sys.stdout.write(''.join(lines))
+            sys.stdout.flush()
+            lines.clear()
 
-                if success:
-                    print(f"[{idx}] ✓ 已转换: {safe_name}.{output_format} (时长: {result:.1f}ms)")
-                    success_count += 1
-                else:
-                    print(f"[{idx}] ✗ 转换失败 '{safe_name}': {result}")
-                    fail_count += 1
+    # 循环开始前按输出格式选定处理函数
+    if output_format == "silk":
+        process = _process_silk
+    else:
+        process = functools.partial(_process_audio, fmt=output_format)
 
-        except Exception as e:
-            print(f"[{idx}] ✗ 处理失败 '{safe_name}': {e}")
-            fail_count += 1
+    # SILK 解码和 ffmpeg 转换都不占用 GIL，各条目可以并行处理
+    max_workers = os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        pending = set()
+        # 输出路径在主线程确定：清理后重名的条目等前一个写完再覆盖，与逐条处理一样以后者为准
+        claimed = {}
+        for idx, (name, value) in enumerate(stream_plist(plist_path), 1):
+            safe_name = sanitize_filename(name)
+            output_path = output_dir / f"{safe_name}.{output_format}"
+            previous = claimed.get(output_path)
+            if previous is not None and previous in pending:
+                wait([previous])
+                pending.discard(previous)
+                report([previous])
+            future = ex.submit(process, idx, safe_name, value, output_path,
+                               force=force or previous is not None)
+            claimed[output_path] = future
+            pending.add(future)
+            # 限制排队的条目数，处理完的条目数据可以及时释放
+            if len(pending) >= max_workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                report(done)
+        report(wait(pending).done, flush=True)
 
     print("-" * 50)
     print(f"完成! 成功: {success_count}, 失败: {fail_count}")
@@ -135,18 +362,25 @@ def main():
         print(f"  python {sys.argv[0]} 软妹怼人有点可爱.plist")
         print(f"  python {sys.argv[0]} 软妹怼人有点可爱.plist ./output mp3")
         print(f"  python {sys.argv[0]} 软妹怼人有点可爱.plist ./output silk")
+        print(f"  python {sys.argv[0]} 软妹怼人有点可爱.plist ./output mp3 --force")
+        return
+
+    force = "--force" in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != "--force"]
+    if not args:
+        print("错误: 缺少 plist 文件路径")
         return
 
-    plist_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
-    output_format = sys.argv[3] if len(sys.argv) > 3 else "mp3"
+    plist_path = args[0]
+    output_dir = args[1] if len(args) > 1 else None
+    output_format = args[2] if len(args) > 2 else "mp3"
 
     if output_format not in ["mp3", "wav", "silk"]:
         print(f"不支持的格式: {output_format}")
         print("支持的格式: mp3, wav, silk")
         return
 
-    convert_plist_to_audio(plist_path, output_dir, output_format)
+    convert_plist_to_audio(plist_path, output_dir, output_format, force)
 
 if __name__ == "__main__":
     main()
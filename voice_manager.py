@@ -11,7 +11,13 @@
 - 保存到 plist 文件
 
 依赖安装:
-    pip install PyQt6 pilk pydub
+    pip install PyQt6 silk-python pydub
+    可选: pip install av  (用 PyAV 解码导入的音频，免去启动 ffmpeg 进程)
+
+使用方法:
+    python voice_manager.py [plist文件路径] [--leave-temps]
+
+    加 --leave-temps 退出时保留试听生成的临时 WAV 文件
 
 注意: 需要 ffmpeg:
     macOS: brew install ffmpeg
@@ -19,10 +25,22 @@
 
 import sys
 import os
+import io
 import plistlib
 import base64
+import binascii
 import tempfile
-import re
+import wave
+import atexit
+import errno
+import functools
+import hashlib
+import shutil
+import platform
+import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional, Dict
 
@@ -30,11 +48,13 @@ from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QListWidget, QListWidgetItem, QLabel, QFileDialog,
     QMessageBox, QLineEdit, QProgressBar, QMenu, QInputDialog,
-    QStatusBar, QToolBar, QSplitter, QFrame, QStyle, QSplashScreen
+    QStatusBar, QToolBar, QSplitter, QFrame, QStyle, QStyleFactory, QSplashScreen
+)
+from PyQt6.QtCore import (
+    Qt, QUrl, QBuffer, QByteArray, QIODevice, QThreadPool, QRunnable, QObject,
+    pyqtSignal, QMimeData, QTimer
 )
-from PyQt6.QtCore import Qt, QUrl, QThread, pyqtSignal, QMimeData, QTimer
 from PyQt6.QtGui import QAction, QDragEnterEvent, QDropEvent, QIcon, QKeySequence, QPixmap
-from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
 
 
 def setup_ffmpeg_path():
@@ -65,57 +85,157 @@ def setup_ffmpeg_path():
             if os.path.exists(ffprobe_path):
                 AudioSegment.ffprobe = ffprobe_path
 
-# 初始化时设置 ffmpeg 路径
-setup_ffmpeg_path()
+# ffmpeg 路径在第一次转换/导出时才设置，启动时不导入 pydub
+_ffmpeg_configured = False
+_ffmpeg_lock = threading.Lock()
+
+
+def _ensure_ffmpeg_configured():
+    global _ffmpeg_configured
+    if _ffmpeg_configured:
+        return
+    with _ffmpeg_lock:
+        if not _ffmpeg_configured:
+            setup_ffmpeg_path()
+            _ffmpeg_configured = True
+
+# 转换用的临时目录，进程退出时整体删除
+_SCRATCH = tempfile.mkdtemp(prefix='silk_')
+atexit.register(shutil.rmtree, _SCRATCH, ignore_errors=True)
+
+
+_SILK_MAGIC = b'\x02#!SILK_V3'
+_SANITIZE_TABLE = str.maketrans('', '', '<>:"/\\|?*')  # 文件名非法字符
+
+# 设置环境变量 VOICE_MGR_DEBUG 后输出 ffmpeg 查找过程
+_DEBUG = bool(os.environ.get('VOICE_MGR_DEBUG'))
+
+
+def _debug(msg: str):
+    if _DEBUG:
+        print(msg)
+
+
+# pysilk / pydub / PyAV 首次使用时才导入，之后直接取缓存的模块
+_pysilk = None
+_AudioSegment = None
+_av = None  # False 表示未安装 PyAV
+
+
+def _get_pysilk():
+    global _pysilk
+    if _pysilk is None:
+        import pysilk
+        _pysilk = pysilk
+    return _pysilk
+
+
+def _get_av():
+    """返回 PyAV 模块，未安装时返回 None"""
+    global _av
+    if _av is None:
+        try:
+            import av
+            _av = av
+        except ImportError:
+            _av = False
+    return _av or None
+
+
+def _get_audio_segment():
+    global _AudioSegment
+    if _AudioSegment is None:
+        _ensure_ffmpeg_configured()
+        from pydub import AudioSegment
+        _AudioSegment = AudioSegment
+    return _AudioSegment
 
 
 class AudioConverter:
     """音频转换工具类"""
 
+    _ffmpeg_path: Optional[str] = None  # get_ffmpeg_path 的缓存
+
     @staticmethod
     def silk_to_pcm(silk_data: bytes) -> Optional[str]:
         """SILK 转 PCM，返回临时文件路径"""
         try:
-            import pilk
-
-            with tempfile.NamedTemporaryFile(suffix='.silk', delete=False) as f:
-                f.write(silk_data)
-                silk_path = f.name
+            pysilk = _get_pysilk()
 
-            pcm_path = silk_path.replace('.silk', '.pcm')
-            pilk.decode(silk_path, pcm_path)
-            os.unlink(silk_path)
+            with tempfile.NamedTemporaryFile(suffix='.pcm', dir=_SCRATCH, delete=False) as f:
+                pysilk.decode(io.BytesIO(silk_data), f, 24000)
+                pcm_path = f.name
             return pcm_path
         except Exception as e:
             print(f"SILK 转 PCM 失败: {e}")
             return None
 
     @staticmethod
-    def silk_to_wav(silk_data: bytes) -> Optional[str]:
-        """SILK 转 WAV，返回临时文件路径"""
-        try:
-            import pilk
-            from pydub import AudioSegment
+    def decode_silk(silk_data: bytes) -> bytes:
+        """SILK 解码为 PCM (16-bit, 24kHz, mono) 数据"""
+        pysilk = _get_pysilk()
 
-            with tempfile.NamedTemporaryFile(suffix='.silk', delete=False) as f:
-                f.write(silk_data)
-                silk_path = f.name
+        pcm_io = io.BytesIO()
+        pysilk.decode(io.BytesIO(silk_data), pcm_io, 24000)
+        return pcm_io.getvalue()
 
-            pcm_path = silk_path.replace('.silk', '.pcm')
-            pilk.decode(silk_path, pcm_path)
+    @staticmethod
+    def silk_to_segment(silk_data: bytes):
+        """SILK 解码为 pydub AudioSegment，PCM 数据不经过磁盘"""
+        AudioSegment = _get_audio_segment()
+
+        return AudioSegment(
+            data=AudioConverter.decode_silk(silk_data),
+            sample_width=2,
+            frame_rate=24000,
+            channels=1
+        )
 
-            audio = AudioSegment.from_raw(
-                pcm_path,
-                sample_width=2,
-                frame_rate=24000,
-                channels=1
-            )
+    @staticmethod
+    def export_silk(silk_data: bytes, file_path: str, fmt: str):
+        """SILK 导出为音频文件，wav 和 mp3 (有 PyAV 时) 不启动 ffmpeg 进程"""
+        if fmt == 'wav':
+            with wave.open(file_path, 'wb') as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(24000)
+                wf.writeframes(AudioConverter.decode_silk(silk_data))
+        elif fmt == 'mp3' and _get_av() is not None:
+            AudioConverter.pcm_to_mp3_av(AudioConverter.decode_silk(silk_data), file_path)
+        else:
+            AudioConverter.silk_to_segment(silk_data).export(file_path, format=fmt)
 
-            wav_path = silk_path.replace('.silk', '.wav')
-            audio.export(wav_path, format='wav')
+    @staticmethod
+    def pcm_to_mp3_av(pcm: bytes, file_path: str):
+        """用 PyAV 把 PCM (16-bit, 24kHz, mono) 编码为 mp3"""
+        av = _get_av()
+        step = 24000 * 2  # 每帧 1 秒
+        with av.open(file_path, 'w') as container:
+            stream = container.add_stream('mp3', rate=24000, layout='mono')
+            for i in range(0, len(pcm), step):
+                chunk = pcm[i:i + step]
+                frame = av.AudioFrame(format='s16', layout='mono', samples=len(chunk) // 2)
+                frame.planes[0].update(chunk)
+                frame.sample_rate = 24000
+                for packet in stream.encode(frame):
+                    container.mux(packet)
+            for packet in stream.encode(None):
+                container.mux(packet)
 
-            os.unlink(silk_path)
-            os.unlink(pcm_path)
+    @staticmethod
+    def silk_to_wav(silk_data: bytes) -> Optional[str]:
+        """SILK 转 WAV，返回临时文件路径"""
+        try:
+            pcm_data = AudioConverter.decode_silk(silk_data)
+
+            # 直接用 wave 模块写 WAV 头，不必经过 pydub/ffmpeg
+            with tempfile.NamedTemporaryFile(suffix='.wav', dir=_SCRATCH, delete=False) as f:
+                with wave.open(f, 'wb') as w:
+                    w.setnchannels(1)
+                    w.setsampwidth(2)
+                    w.setframerate(24000)
+                    w.writeframes(pcm_data)
+                wav_path = f.name
             return wav_path
         except Exception as e:
             print(f"SILK 转 WAV 失败: {e}")
@@ -123,60 +243,75 @@ class AudioConverter:
 
     @staticmethod
     def get_ffmpeg_path() -> str:
-        """获取 ffmpeg 路径"""
-        import platform
-        import shutil
+        """获取 ffmpeg 路径，找到后缓存，不再重复查找"""
+        if AudioConverter._ffmpeg_path is not None:
+            return AudioConverter._ffmpeg_path
+
+        _ensure_ffmpeg_configured()
+        ffmpeg = AudioConverter._find_ffmpeg_path()
+        # 没找到时不缓存，用户之后安装 ffmpeg 仍能生效
+        if os.path.isabs(ffmpeg):
+            AudioConverter._ffmpeg_path = ffmpeg
+        return ffmpeg
+
+    @staticmethod
+    def _find_ffmpeg_path() -> str:
+        """查找 ffmpeg 路径"""
         is_windows = platform.system() == 'Windows'
         is_macos = platform.system() == 'Darwin'
         ffmpeg_name = 'ffmpeg.exe' if is_windows else 'ffmpeg'
 
         # 打包后的应用：优先使用打包目录中的 ffmpeg
         if getattr(sys, 'frozen', False):
-            print(f"[ffmpeg] 运行在打包模式, frozen={sys.frozen}")
-            print(f"[ffmpeg] sys.executable={sys.executable}")
+            _debug(f"[ffmpeg] 运行在打包模式, frozen={sys.frozen}")
+            _debug(f"[ffmpeg] sys.executable={sys.executable}")
 
             if hasattr(sys, '_MEIPASS'):
                 # PyInstaller onefile 模式
-                print(f"[ffmpeg] _MEIPASS={sys._MEIPASS}")
+                _debug(f"[ffmpeg] _MEIPASS={sys._MEIPASS}")
                 ffmpeg = os.path.join(sys._MEIPASS, ffmpeg_name)
-                if os.path.exists(ffmpeg):
-                    print(f"[ffmpeg] 找到 (onefile): {ffmpeg}")
+                if os.path.isfile(ffmpeg):
+                    _debug(f"[ffmpeg] 找到 (onefile): {ffmpeg}")
                     return ffmpeg
             else:
                 # PyInstaller onedir 模式
                 base_path = os.path.dirname(sys.executable)
-                print(f"[ffmpeg] onedir base_path={base_path}")
+                _debug(f"[ffmpeg] onedir base_path={base_path}")
 
                 if is_windows:
                     # Windows: exe 同目录或 _internal 目录
-                    candidates = [
-                        os.path.join(base_path, ffmpeg_name),
-                        os.path.join(base_path, '_internal', ffmpeg_name),
-                    ]
-                    print(f"[ffmpeg] Windows 候选路径: {candidates}")
-                    for ffmpeg in candidates:
-                        if os.path.exists(ffmpeg):
-                            print(f"[ffmpeg] 找到 (onedir): {ffmpeg}")
-                            return ffmpeg
-                    # 列出目录内容以便调试
-                    print(f"[ffmpeg] 目录内容 ({base_path}):")
+                    # exe 目录只扫描一次，查找和调试输出共用同一份列表
                     try:
-                        for f in os.listdir(base_path)[:20]:
-                            print(f"  - {f}")
-                    except Exception as e:
-                        print(f"  列目录失败: {e}")
+                        with os.scandir(base_path) as it:
+                            entries = {entry.name.lower(): entry for entry in it}
+                    except OSError as e:
+                        _debug(f"[ffmpeg] 列目录失败: {e}")
+                        entries = {}
+                    entry = entries.get(ffmpeg_name)
+                    if entry is not None and entry.is_file():
+                        _debug(f"[ffmpeg] 找到 (onedir): {entry.path}")
+                        return entry.path
+                    ffmpeg = os.path.join(base_path, '_internal', ffmpeg_name)
+                    if os.path.isfile(ffmpeg):
+                        _debug(f"[ffmpeg] 找到 (onedir): {ffmpeg}")
+                        return ffmpeg
+                    # 列出目录内容以便调试
+                    if _DEBUG:
+                        _debug(f"[ffmpeg] 目录内容 ({base_path}):")
+                        for entry in list(entries.values())[:20]:
+                            print(f"  - {entry.name}")
 
                 elif is_macos:
                     # macOS: Frameworks 目录
                     app_path = os.path.dirname(os.path.dirname(base_path))
                     ffmpeg = os.path.join(app_path, 'Frameworks', ffmpeg_name)
-                    print(f"[ffmpeg] macOS Frameworks 路径: {ffmpeg}")
-                    if os.path.exists(ffmpeg):
-                        print(f"[ffmpeg] 找到 (Frameworks): {ffmpeg}")
+                    _debug(f"[ffmpeg] macOS Frameworks 路径: {ffmpeg}")
+                    if os.path.isfile(ffmpeg):
+                        _debug(f"[ffmpeg] 找到 (Frameworks): {ffmpeg}")
                         return ffmpeg
 
         # 未打包或打包目录中没有 ffmpeg：使用系统安装的版本
-        print("[ffmpeg] 尝试查找系统安装的 ffmpeg...")
+        _debug("[ffmpeg] 尝试查找系统安装的 ffmpeg...")
         if is_windows:
             system_ffmpeg_paths = [
                 r'C:\ProgramData\chocolatey\bin\ffmpeg.exe',  # Chocolatey
@@ -193,101 +328,137 @@ class AudioConverter:
             ]
 
         for path in system_ffmpeg_paths:
-            if path and os.path.exists(path):
-                print(f"[ffmpeg] 找到系统版本: {path}")
+            if path and os.path.isfile(path):
+                _debug(f"[ffmpeg] 找到系统版本: {path}")
                 return path
 
         # 最后尝试 PATH
         which_ffmpeg = shutil.which(ffmpeg_name)
         if which_ffmpeg:
-            print(f"[ffmpeg] 在 PATH 中找到: {which_ffmpeg}")
+            _debug(f"[ffmpeg] 在 PATH 中找到: {which_ffmpeg}")
             return which_ffmpeg
 
-        print(f"[ffmpeg] 未找到，使用默认名称: {ffmpeg_name}")
+        _debug(f"[ffmpeg] 未找到，使用默认名称: {ffmpeg_name}")
         return ffmpeg_name  # 使用 PATH 中的 ffmpeg
 
     @staticmethod
-    def audio_to_silk(input_path: str) -> Optional[bytes]:
-        """将音频/视频文件转换为 SILK 格式"""
+    def pcm_from_wav(input_path: str) -> Optional[bytes]:
+        """WAV 已是 16-bit/24kHz/单声道时直接读取 PCM，否则返回 None"""
+        if not input_path.lower().endswith('.wav'):
+            return None
         try:
-            import pilk
-            import subprocess
-
-            # 使用 subprocess 直接调用 ffmpeg，避免库冲突
-            ffmpeg = AudioConverter.get_ffmpeg_path()
-            print(f"使用 ffmpeg: {ffmpeg}")
-
-            # 检查 ffmpeg 是否存在
-            if not os.path.isabs(ffmpeg) or not os.path.exists(ffmpeg):
-                # 如果不是绝对路径或文件不存在，尝试 which/where
-                import shutil
-                resolved = shutil.which(ffmpeg)
-                if resolved:
-                    print(f"[ffmpeg] 解析后路径: {resolved}")
-                    ffmpeg = resolved
-                else:
-                    print(f"[ffmpeg] 错误: ffmpeg 未找到! 路径: {ffmpeg}")
-                    print(f"[ffmpeg] 请确保已安装 ffmpeg 并添加到系统 PATH")
+            with wave.open(input_path, 'rb') as wf:
+                if (wf.getnchannels(), wf.getsampwidth(), wf.getframerate()) != (1, 2, 24000):
                     return None
+                return wf.readframes(wf.getnframes())
+        except (wave.Error, EOFError):
+            return None
 
-            # 创建临时 PCM 文件
-            with tempfile.NamedTemporaryFile(suffix='.pcm', delete=False) as f:
-                pcm_path = f.name
+    @staticmethod
+    def pcm_with_av(input_path: str) -> bytes:
+        """用 PyAV 解码为 PCM (16-bit, 24kHz, mono)，不启动 ffmpeg 进程"""
+        av = _get_av()
+        resampler = av.AudioResampler(format='s16', layout='mono', rate=24000)
+        pcm = bytearray()
+        with av.open(input_path) as container:
+            for frame in container.decode(audio=0):
+                for out in resampler.resample(frame):
+                    pcm += bytes(out.planes[0])[:out.samples * 2]
+            # 取出重采样器中剩余的数据
+            for out in resampler.resample(None):
+                pcm += bytes(out.planes[0])[:out.samples * 2]
+        return bytes(pcm)
 
-            # 使用 ffmpeg 转换为 PCM (16-bit, 24kHz, mono)
-            print(f"正在转换音频: {input_path}")
-            cmd = [
-                ffmpeg, '-y', '-i', input_path,
-                '-f', 's16le', '-ar', '24000', '-ac', '1',
-                pcm_path
-            ]
+    @staticmethod
+    def pcm_with_ffmpeg(input_path: str) -> Optional[bytes]:
+        """调用 ffmpeg 转换为 PCM (16-bit, 24kHz, mono)"""
+        # 使用 subprocess 直接调用 ffmpeg，避免库冲突
+        ffmpeg = AudioConverter.get_ffmpeg_path()
+        _debug(f"使用 ffmpeg: {ffmpeg}")
+
+        # 绝对路径来自 get_ffmpeg_path 里已确认存在的查找结果，不再逐次检查；
+        # 文件之后被删除时由下面的 FileNotFoundError 处理
+        if not os.path.isabs(ffmpeg):
+            # 如果不是绝对路径，尝试 which/where
+            resolved = shutil.which(ffmpeg)
+            if resolved:
+                _debug(f"[ffmpeg] 解析后路径: {resolved}")
+                ffmpeg = resolved
+            else:
+                print(f"[ffmpeg] 错误: ffmpeg 未找到! 路径: {ffmpeg}")
+                print(f"[ffmpeg] 请确保已安装 ffmpeg 并添加到系统 PATH")
+                return None
 
-            # 设置环境变量，避免库冲突
-            import platform
-            env = os.environ.copy()
-
-            if getattr(sys, 'frozen', False):
-                if platform.system() == 'Darwin':
-                    # macOS: 清除可能导致冲突的库路径
-                    env.pop('DYLD_LIBRARY_PATH', None)
-                    env.pop('DYLD_FALLBACK_LIBRARY_PATH', None)
-                    env.pop('LD_LIBRARY_PATH', None)
-                    # 设置 DYLD_LIBRARY_PATH 指向系统库，避免加载 PyQt6 的 FFmpeg 库
-                    env['DYLD_LIBRARY_PATH'] = '/usr/lib:/usr/local/lib:/opt/homebrew/lib'
-                elif platform.system() == 'Windows':
-                    # Windows: 清理 PATH，移除可能包含 PyQt6 库的路径
-                    base_path = os.path.dirname(sys.executable)
-                    # 将 ffmpeg 所在目录添加到 PATH 最前面
-                    ffmpeg_dir = os.path.dirname(ffmpeg)
-                    if os.path.exists(ffmpeg_dir):
-                        env['PATH'] = ffmpeg_dir + os.pathsep + env.get('PATH', '')
-
-            # 运行 ffmpeg
+        # PCM 直接输出到 stdout，不写中间文件
+        cmd = [
+            ffmpeg, '-nostdin', '-i', input_path,
+            '-f', 's16le', '-ar', '24000', '-ac', '1',
+            'pipe:1'
+        ]
+
+        # 设置环境变量，避免库冲突
+        env = os.environ.copy()
+
+        if getattr(sys, 'frozen', False):
+            if platform.system() == 'Darwin':
+                # macOS: 清除可能导致冲突的库路径
+                env.pop('DYLD_LIBRARY_PATH', None)
+                env.pop('DYLD_FALLBACK_LIBRARY_PATH', None)
+                env.pop('LD_LIBRARY_PATH', None)
+                # 设置 DYLD_LIBRARY_PATH 指向系统库，避免加载 PyQt6 的 FFmpeg 库
+                env['DYLD_LIBRARY_PATH'] = '/usr/lib:/usr/local/lib:/opt/homebrew/lib'
+            elif platform.system() == 'Windows':
+                # Windows: 清理 PATH，移除可能包含 PyQt6 库的路径
+                base_path = os.path.dirname(sys.executable)
+                # 将 ffmpeg 所在目录添加到 PATH 最前面
+                env['PATH'] = os.path.dirname(ffmpeg) + os.pathsep + env.get('PATH', '')
+
+        # 运行 ffmpeg
+        try:
             if platform.system() == 'Windows':
                 # Windows 上使用 CREATE_NO_WINDOW 标志避免弹出命令行窗口
                 creation_flags = subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0x08000000
-                result = subprocess.run(cmd, capture_output=True, text=True, env=env, creationflags=creation_flags)
+                result = subprocess.run(cmd, capture_output=True, env=env, creationflags=creation_flags)
             else:
-                result = subprocess.run(cmd, capture_output=True, text=True, env=env)
-            if result.returncode != 0:
-                print(f"ffmpeg 错误: {result.stderr}")
-                return None
+                result = subprocess.run(cmd, capture_output=True, env=env)
+        except FileNotFoundError:
+            # 缓存的 ffmpeg 已不存在，下次重新查找
+            AudioConverter._ffmpeg_path = None
+            print(f"[ffmpeg] 错误: ffmpeg 未找到! 路径: {ffmpeg}")
+            return None
+        if result.returncode != 0:
+            print(f"ffmpeg 错误: {result.stderr.decode(errors='replace')}")
+            return None
 
-            print(f"PCM 转换成功")
+        return result.stdout
 
-            # PCM 转 SILK
-            silk_path = pcm_path.replace('.pcm', '.silk')
-            print(f"正在转换为 SILK: {silk_path}")
-            pilk.encode(pcm_path, silk_path, pcm_rate=24000, tencent=True)
-            print(f"SILK 转换成功")
+    @staticmethod
+    def audio_to_silk(input_path: str) -> Optional[bytes]:
+        """将音频/视频文件转换为 SILK 格式"""
+        try:
+            pysilk = _get_pysilk()
 
-            # 读取 SILK 数据
-            with open(silk_path, 'rb') as f:
-                silk_data = f.read()
+            print(f"正在转换音频: {input_path}")
+            pcm_data = AudioConverter.pcm_from_wav(input_path)
+            if pcm_data is None and _get_av() is not None:
+                try:
+                    pcm_data = AudioConverter.pcm_with_av(input_path)
+                except Exception as e:
+                    # PyAV 无法处理时退回到 ffmpeg 进程
+                    print(f"PyAV 解码失败，改用 ffmpeg: {e}")
+            if pcm_data is None:
+                pcm_data = AudioConverter.pcm_with_ffmpeg(input_path)
+                if pcm_data is None:
+                    return None
+
+            print(f"PCM 转换成功")
 
-            # 清理临时文件
-            os.unlink(pcm_path)
-            os.unlink(silk_path)
+            # PCM 转 SILK，直接编码到内存
+            print(f"正在转换为 SILK")
+            silk_io = io.BytesIO()
+            pysilk.encode(io.BytesIO(pcm_data), silk_io, 24000, 24000, tencent=True)
+            silk_data = silk_io.getvalue()
+            print(f"SILK 转换成功")
 
             return silk_data
         except Exception as e:
@@ -297,22 +468,186 @@ class AudioConverter:
             return None
 
 
-class ConvertThread(QThread):
-    """后台转换线程"""
+class ConvertSignals(QObject):
+    """转换任务的信号 (QRunnable 本身不能发信号)"""
     finished = pyqtSignal(str, bytes)  # name, silk_data
     error = pyqtSignal(str, str)  # name, error_message
 
+
+class ConvertTask(QRunnable):
+    """线程池中的后台转换任务"""
+
     def __init__(self, file_path: str, name: str):
         super().__init__()
         self.file_path = file_path
         self.name = name
+        self.signals = ConvertSignals()
 
     def run(self):
         silk_data = AudioConverter.audio_to_silk(self.file_path)
         if silk_data:
-            self.finished.emit(self.name, silk_data)
+            self.signals.finished.emit(self.name, silk_data)
+        else:
+            self.signals.error.emit(self.name, "转换失败")
+
+
+def content_digest(audio_data: Dict[str, bytes]) -> bytes:
+    """音频数据 (含名称和顺序) 的摘要，用于判断内容是否与上次保存时相同"""
+    h = hashlib.blake2b(digest_size=16)
+    for name, value in audio_data.items():
+        encoded = name.encode('utf-8')
+        h.update(len(encoded).to_bytes(4, 'little'))
+        h.update(encoded)
+        # plist 中可能混有整数、字典等非音频的条目，按 repr 计入摘要
+        if not isinstance(value, bytes):
+            value = repr(value).encode('utf-8')
+        h.update(len(value).to_bytes(8, 'little'))
+        h.update(value)
+    return h.digest()
+
+
+def read_plist(path: str):
+    """读取 plist，返回 (name -> 原始数据, 是否为二进制格式, 是否为旧的 base64 字符串格式, 内容摘要)"""
+    with open(path, 'rb') as f:
+        is_binary = f.read(8) == b'bplist00'
+        f.seek(0)
+        data = plistlib.load(f)
+
+    # 旧格式以 base64 字符串保存，加载时解码一次，之后只保留原始数据
+    # 原地替换，每条字符串解码后即可释放，不必同时持有两份完整数据
+    # 'version': '1.0' 这类普通文本不是合法 base64，保持原样
+    legacy_strings = False
+    for name, value in data.items():
+        if isinstance(value, str):
+            try:
+                data[name] = binascii.a2b_base64(value, strict_mode=True)
+            except binascii.Error:
+                continue
+            legacy_strings = True
+    return data, is_binary, legacy_strings, content_digest(data)
+
+
+class LoadSignals(QObject):
+    """加载任务的信号"""
+    loaded = pyqtSignal(str, object)  # file_path, read_plist 的结果
+    error = pyqtSignal(str)  # error_message
+
+
+class PlistLoadTask(QRunnable):
+    """后台解析 plist"""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self.signals = LoadSignals()
+
+    def run(self):
+        try:
+            loaded = read_plist(self.path)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.loaded.emit(self.path, loaded)
+
+
+_WRITE_BUFFER = 1 << 20
+
+
+def write_plist(path: str, audio_data: Dict[str, bytes], fmt, legacy_strings: bool):
+    """把音频数据写入 plist 文件，先写临时文件再替换，中途出错不会损坏原文件"""
+    if legacy_strings:
+        # 旧语音包保持 base64 字符串格式，兼容只认字符串的读取方
+        # 只编码音频数据，文本、整数等其它条目原样写回
+        data = {
+            name: base64.b64encode(value).decode('ascii') if isinstance(value, bytes) else value
+            for name, value in audio_data.items()
+        }
+    else:
+        # 其余情况直接写 <data>，由 plistlib 负责编码
+        data = audio_data
+
+    # 先估算文件大小，空间不够时直接报错，不必序列化到一半才失败
+    # 只计入音频数据，整数、字典等条目体积可忽略
+    estimate = sum(len(v) for v in audio_data.values() if isinstance(v, (bytes, str)))
+    if legacy_strings or fmt == plistlib.FMT_XML:
+        estimate = estimate * 4 // 3  # base64 膨胀
+    estimate += 64 * 1024
+    free = shutil.disk_usage(os.path.dirname(os.path.abspath(path))).free
+    if free < estimate:
+        raise OSError(errno.ENOSPC, f"磁盘空间不足: 需要约 {estimate // 1024} KB，可用 {free // 1024} KB")
+
+    tmp_path = path + '.tmp'
+    try:
+        # 1 MiB 写缓冲，plistlib 的大量小块写入合并成少数几次系统调用
+        with open(tmp_path, 'wb', buffering=_WRITE_BUFFER) as f:
+            plistlib.dump(data, f, fmt=fmt)
+            f.flush()
+            os.fsync(f.fileno())
+
+        try:
+            os.replace(tmp_path, path)
+        except PermissionError:
+            # 目标文件只读 (Windows 上无法替换)，添加写入权限后重试一次
+            os.chmod(path, os.stat(path).st_mode | 0o200)
+            os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class SaveSignals(QObject):
+    """保存任务的信号"""
+    finished = pyqtSignal(bool, str, bytes)  # success, error_message, 保存内容的摘要
+
+
+class PlistSaveTask(QRunnable):
+    """后台保存 plist，界面线程不等待序列化和写盘"""
+
+    def __init__(self, path: str, audio_data: Dict[str, bytes], fmt, legacy_strings: bool):
+        super().__init__()
+        self.path = path
+        self.audio_data = audio_data
+        self.fmt = fmt
+        self.legacy_strings = legacy_strings
+        self.signals = SaveSignals()
+
+    def run(self):
+        try:
+            write_plist(self.path, self.audio_data, self.fmt, self.legacy_strings)
+        except PermissionError:
+            self.signals.finished.emit(False, "没有写入权限，请检查文件权限或尝试「另存为」", b'')
+        except Exception as e:
+            self.signals.finished.emit(False, str(e), b'')
         else:
-            self.error.emit(self.name, "转换失败")
+            self.signals.finished.emit(True, "", content_digest(self.audio_data))
+
+
+# 音频列表样式，模块加载时构造一次
+_LIST_STYLE = """
+    QListWidget {
+        font-size: 14px;
+        border: 2px dashed #ccc;
+        border-radius: 8px;
+    }
+    QListWidget::item {
+        padding: 8px;
+        border-bottom: 1px solid #eee;
+    }
+    QListWidget::item:selected {
+        background-color: #0078d4;
+        color: white;
+    }
+    QListWidget::item:selected:hover {
+        background-color: #006cbd;
+        color: white;
+    }
+    QListWidget::item:!selected:hover {
+        background-color: #e5f3ff;
+    }
+"""
 
 
 class AudioListWidget(QListWidget):
@@ -325,62 +660,59 @@ class AudioListWidget(QListWidget):
         self.setDragDropMode(QListWidget.DragDropMode.DropOnly)
         self.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
         self.setAlternatingRowColors(True)
-        self.setStyleSheet("""
-            QListWidget {
-                font-size: 14px;
-                border: 2px dashed #ccc;
-                border-radius: 8px;
-            }
-            QListWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #eee;
-            }
-            QListWidget::item:selected {
-                background-color: #0078d4;
-                color: white;
-            }
-            QListWidget::item:selected:hover {
-                background-color: #006cbd;
-                color: white;
-            }
-            QListWidget::item:!selected:hover {
-                background-color: #e5f3ff;
-            }
-        """)
+        self.setStyleSheet(_LIST_STYLE)
 
     def dragEnterEvent(self, event: QDragEnterEvent):
         if event.mimeData().hasUrls():
-            event.acceptProposedAction()
+            event.setDropAction(Qt.DropAction.CopyAction)
+            event.accept()
 
     def dragMoveEvent(self, event):
         if event.mimeData().hasUrls():
-            event.acceptProposedAction()
+            event.setDropAction(Qt.DropAction.CopyAction)
+            event.accept()
 
     def dropEvent(self, event: QDropEvent):
-        files = []
-        for url in event.mimeData().urls():
-            file_path = url.toLocalFile()
-            if file_path:
-                files.append(file_path)
+        files = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
         if files:
+            # 只复制：接受 Shift 拖动提议的 MoveAction 会让来源删除原文件
+            event.setDropAction(Qt.DropAction.CopyAction)
+            event.accept()
             self.files_dropped.emit(files)
 
 
 class VoiceManagerWindow(QMainWindow):
     """主窗口"""
 
-    SUPPORTED_FORMATS = {'.mp3', '.wav', '.m4a', '.aac', '.ogg', '.flac',
-                         '.mp4', '.mov', '.avi', '.mkv', '.webm'}
+    SUPPORTED_FORMATS = frozenset({'.mp3', '.wav', '.m4a', '.aac', '.ogg', '.flac',
+                                   '.mp4', '.mov', '.avi', '.mkv', '.webm'})
+    WAV_CACHE_SIZE = 32  # 最多缓存的已解码 WAV 数量
 
     def __init__(self):
         super().__init__()
         self.plist_path: Optional[str] = None
-        self.audio_data: Dict[str, str] = {}  # name -> base64 data
-        self.temp_files: list = []
+        self.audio_data: Dict[str, bytes] = {}  # name -> 原始音频数据
+        self._wav_cache: "OrderedDict[str, str]" = OrderedDict()  # name -> 已解码的 WAV 路径
+        self._display_cache: Dict[str, str] = {}  # name -> 列表显示文本
+        self.plist_fmt = plistlib.FMT_BINARY  # 保存格式，加载时沿用原文件格式
+        self.legacy_strings = False  # 原文件用 base64 字符串保存音频时为 True
         self.modified = False
         self.current_playing: Optional[str] = None
-
-        # 媒体播放器
+        self._play_buffer: Optional[QBuffer] = None  # 正在播放的内存数据，需保持引用
+        self.convert_pool = QThreadPool(self)
+        self.convert_pending = 0
+        # 保存只用一个线程，保证写入按顺序完成
+        self.save_pool = QThreadPool(self)
+        self.save_pool.setMaxThreadCount(1)
+        self._save_in_flight = False
+        self._save_queued = False  # 保存期间又请求了保存，完成后接着再存一次
+        self._saving_path: Optional[str] = None
+        self._unsaved_dialog: Optional[QMessageBox] = None
+        self.leave_temps = False  # --leave-temps: 退出时不删除临时文件
+        self._last_saved_hash: Optional[bytes] = None  # 文件中内容的摘要，新建时为 None
+
+        # 媒体播放器 (QtMultimedia 较重，创建窗口时才导入)
+        from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
         self.player = QMediaPlayer()
         self.audio_output = QAudioOutput()
         self.player.setAudioOutput(self.audio_output)
@@ -514,24 +846,65 @@ class VoiceManagerWindow(QMainWindow):
 
     def load_plist(self, file_path: str):
         try:
-            with open(file_path, 'rb') as f:
-                self.audio_data = plistlib.load(f)
-
-            self.plist_path = file_path
-            self.modified = False
-            self.update_ui()
-            self.status_bar.showMessage(f"已加载 {len(self.audio_data)} 个音频")
+            loaded = read_plist(file_path)
         except Exception as e:
-            QMessageBox.critical(self, "错误", f"加载失败: {e}")
+            self.on_load_error(str(e))
+            return
+        self.on_plist_loaded(file_path, loaded)
+
+    def load_plist_async(self, file_path: str):
+        """在线程池中解析 plist，完成后回到界面线程填充列表"""
+        self._wait_for_save()
+        task = PlistLoadTask(file_path)
+        task.signals.loaded.connect(self.on_plist_loaded)
+        task.signals.error.connect(self.on_load_error)
+        self.status_bar.showMessage(f"正在加载: {file_path}")
+        QThreadPool.globalInstance().start(task)
+
+    def on_plist_loaded(self, file_path: str, loaded: tuple):
+        # 先让进行中的保存 (包括排队的) 写完旧文件，它的完成回调不能改到新加载的包上
+        self._wait_for_save()
+
+        data, is_binary, legacy_strings, digest = loaded
+        self.audio_data = data
+        self.legacy_strings = legacy_strings
+        self._last_saved_hash = digest
+
+        self._clear_wav_cache()
+        self._display_cache.clear()
+        self.plist_fmt = plistlib.FMT_BINARY if is_binary else plistlib.FMT_XML
+        self.plist_path = file_path
+        self.modified = False
+        self.update_ui()
+        self.status_bar.showMessage(f"已加载 {len(self.audio_data)} 个音频")
 
-    def update_ui(self):
-        self.audio_list.clear()
-
-        for name in self.audio_data.keys():
-            item = QListWidgetItem(f"🔊 {name}")
-            item.setData(Qt.ItemDataRole.UserRole, name)
-            self.audio_list.addItem(item)
+    def on_load_error(self, error: str):
+        self.status_bar.showMessage("加载失败")
+        QMessageBox.critical(self, "错误", f"加载失败: {error}")
 
+    def update_ui(self):
+        # 批量重建列表，期间暂停重绘和信号
+        self.audio_list.setUpdatesEnabled(False)
+        self.audio_list.blockSignals(True)
+        try:
+            self.audio_list.clear()
+            self.audio_list.addItems([self._display_text(name) for name in self.audio_data])
+            for row, name in enumerate(self.audio_data):
+                self.audio_list.item(row).setData(Qt.ItemDataRole.UserRole, name)
+        finally:
+            self.audio_list.blockSignals(False)
+            self.audio_list.setUpdatesEnabled(True)
+
+        self.update_header()
+
+    def _display_text(self, name: str) -> str:
+        text = self._display_cache.get(name)
+        if text is None:
+            text = self._display_cache[name] = f"🔊 {name}"
+        return text
+
+    def update_header(self):
+        """更新标题、文件信息和保存按钮，不动列表"""
         if self.plist_path:
             title = f"语音包管理器 - {Path(self.plist_path).name}"
             if self.modified:
@@ -556,27 +929,27 @@ class VoiceManagerWindow(QMainWindow):
         self.stop_playback()
 
         try:
-            # 解码 Base64
-            audio_bytes = base64.b64decode(self.audio_data[name])
+            audio_bytes = self.audio_data[name]
 
             # 检查是否是 SILK 格式
-            if audio_bytes.startswith(b'\x02#!SILK_V3'):
-                wav_path = AudioConverter.silk_to_wav(audio_bytes)
+            if audio_bytes.startswith(_SILK_MAGIC):
+                wav_path = self._cached_wav(name, audio_bytes)
                 if wav_path:
-                    self.temp_files.append(wav_path)
                     self.player.setSource(QUrl.fromLocalFile(wav_path))
+                    self._play_buffer = None
                     self.player.play()
                     self.current_playing = name
                     self.status_bar.showMessage(f"正在播放: {name}")
                 else:
                     QMessageBox.warning(self, "播放失败", "无法解码 SILK 音频")
             else:
-                # 尝试直接播放
-                with tempfile.NamedTemporaryFile(suffix='.audio', delete=False) as f:
-                    f.write(audio_bytes)
-                    temp_path = f.name
-                self.temp_files.append(temp_path)
-                self.player.setSource(QUrl.fromLocalFile(temp_path))
+                # 尝试直接从内存播放，不写临时文件
+                # buffer 不设 parent，切换音源后释放引用即可回收
+                buf = QBuffer()
+                buf.setData(QByteArray(audio_bytes))
+                buf.open(QIODevice.OpenModeFlag.ReadOnly)
+                self.player.setSourceDevice(buf, QUrl("audio://clip"))
+                self._play_buffer = buf
                 self.player.play()
                 self.current_playing = name
                 self.status_bar.showMessage(f"正在播放: {name}")
@@ -584,13 +957,46 @@ class VoiceManagerWindow(QMainWindow):
         except Exception as e:
             QMessageBox.warning(self, "播放失败", str(e))
 
+    def _cached_wav(self, name: str, silk_data: bytes) -> Optional[str]:
+        """取已解码的 WAV，未命中时解码并放入 LRU 缓存"""
+        wav_path = self._wav_cache.get(name)
+        if wav_path and os.path.exists(wav_path):
+            self._wav_cache.move_to_end(name)
+            return wav_path
+
+        wav_path = AudioConverter.silk_to_wav(silk_data)
+        if not wav_path:
+            return None
+        self._wav_cache[name] = wav_path
+        if len(self._wav_cache) > self.WAV_CACHE_SIZE:
+            _, old_path = self._wav_cache.popitem(last=False)
+            self._unlink_quiet(old_path)
+        return wav_path
+
+    def _invalidate_wav(self, name: str):
+        wav_path = self._wav_cache.pop(name, None)
+        if wav_path:
+            self._unlink_quiet(wav_path)
+
+    def _clear_wav_cache(self):
+        while self._wav_cache:
+            self._unlink_quiet(self._wav_cache.popitem()[1])
+
+    @staticmethod
+    def _unlink_quiet(path: str):
+        # 正在播放的文件在 Windows 上可能删不掉，留给退出时清理
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
     def stop_playback(self):
         self.player.stop()
         self.current_playing = None
         self.status_bar.showMessage("已停止")
 
     def on_media_status_changed(self, status):
-        if status == QMediaPlayer.MediaStatus.EndOfMedia:
+        if status == self.player.MediaStatus.EndOfMedia:
             self.current_playing = None
             self.status_bar.showMessage("播放完成")
 
@@ -609,88 +1015,102 @@ class VoiceManagerWindow(QMainWindow):
                 self.load_plist(f)
                 return
 
-        # 筛选有效的音频/视频文件
-        valid_files = []
-        for f in files:
-            ext = Path(f).suffix.lower()
-            if ext in self.SUPPORTED_FORMATS:
-                valid_files.append(f)
+        # 筛选有效的音频/视频文件 (splitext 比构造 Path 对象快)
+        valid_files = [f for f in files
+                       if os.path.splitext(f)[1].lower() in self.SUPPORTED_FORMATS]
 
         if not valid_files:
             QMessageBox.warning(self, "不支持的格式",
                 f"支持的格式: {', '.join(self.SUPPORTED_FORMATS)}")
             return
 
-        # 如果没有加载 plist，创建一个新的
-        if not self.plist_path:
+        # 如果没有加载 plist 也还没有新建，创建一个新的；已新建时继续往里添加
+        if not self.plist_path and not self.audio_data:
             self.audio_data = {}
             self.plist_path = None  # 新建的，还没有保存路径
+            self.plist_fmt = plistlib.FMT_BINARY
+            self.legacy_strings = False
+            self._last_saved_hash = None
             self.modified = True
             self.file_label.setText("📄 新建语音包（未保存）")
             self.setWindowTitle("语音包管理器 - 新建 *")
 
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setMaximum(len(valid_files))
-        self.progress_bar.setValue(0)
+        # 先依次确认所有文件的名称，再一起提交转换
+        jobs = []
+        batch_names = set()
+        for file_path in valid_files:
+            default_name = Path(file_path).stem
+
+            # 让用户自定义名称
+            name, ok = QInputDialog.getText(
+                self, "设置音频名称",
+                f"文件: {Path(file_path).name}\n\n请输入音频名称:",
+                text=default_name
+            )
 
-        self.convert_queue = valid_files.copy()
-        self.convert_next()
+            if not ok or not name.strip():
+                # 用户取消，跳过此文件
+                continue
 
-    def convert_next(self):
-        if not self.convert_queue:
-            self.progress_bar.setVisible(False)
-            self.status_bar.showMessage("添加完成")
-            return
+            name = name.strip()
 
-        file_path = self.convert_queue.pop(0)
-        default_name = Path(file_path).stem
+            # 检查名称是否已存在
+            if name in self.audio_data or name in batch_names:
+                reply = QMessageBox.question(
+                    self, "名称已存在",
+                    f"「{name}」已存在，是否覆盖？",
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+                )
+                if reply != QMessageBox.StandardButton.Yes:
+                    continue
 
-        # 让用户自定义名称
-        name, ok = QInputDialog.getText(
-            self, "设置音频名称",
-            f"文件: {Path(file_path).name}\n\n请输入音频名称:",
-            text=default_name
-        )
+            batch_names.add(name)
+            jobs.append((file_path, name))
 
-        if not ok or not name.strip():
-            # 用户取消，跳过此文件，继续下一个
-            self.progress_bar.setValue(self.progress_bar.value() + 1)
-            self.convert_next()
+        if not jobs:
             return
 
-        name = name.strip()
-
-        # 检查名称是否已存在
-        if name in self.audio_data:
-            reply = QMessageBox.question(
-                self, "名称已存在",
-                f"「{name}」已存在，是否覆盖？",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-            )
-            if reply != QMessageBox.StandardButton.Yes:
-                self.progress_bar.setValue(self.progress_bar.value() + 1)
-                self.convert_next()
-                return
-
-        self.status_bar.showMessage(f"正在转换: {name}")
-
-        self.convert_thread = ConvertThread(file_path, name)
-        self.convert_thread.finished.connect(self.on_convert_finished)
-        self.convert_thread.error.connect(self.on_convert_error)
-        self.convert_thread.start()
+        # 上一批还没转换完时，在原有进度上累加
+        total = len(jobs)
+        if self.convert_pending:
+            total += self.progress_bar.maximum()
+        else:
+            self.progress_bar.setValue(0)
+        self.progress_bar.setMaximum(total)
+        self.progress_bar.setVisible(True)
+        self.status_bar.showMessage(f"正在转换 {len(jobs)} 个文件...")
+
+        # 各文件互不依赖，按 CPU 核数并行转换
+        self.convert_pool.setMaxThreadCount(
+            min(os.cpu_count() or 1, self.convert_pending + len(jobs)))
+        for file_path, name in jobs:
+            task = ConvertTask(file_path, name)
+            task.signals.finished.connect(self.on_convert_finished)
+            task.signals.error.connect(self.on_convert_error)
+            self.convert_pending += 1
+            self.convert_pool.start(task)
+
+    def _convert_done(self):
+        self.convert_pending -= 1
+        self.progress_bar.setValue(self.progress_bar.value() + 1)
+        if not self.convert_pending:
+            self.progress_bar.setVisible(False)
+            self.status_bar.showMessage("添加完成")
 
     def on_convert_finished(self, name: str, silk_data: bytes):
-        self.audio_data[name] = base64.b64encode(silk_data).decode('utf-8')
+        if name not in self.audio_data:
+            item = QListWidgetItem(self._display_text(name))
+            item.setData(Qt.ItemDataRole.UserRole, name)
+            self.audio_list.addItem(item)
+        self.audio_data[name] = silk_data
+        self._invalidate_wav(name)
         self.modified = True
-        self.update_ui()
-
-        self.progress_bar.setValue(self.progress_bar.value() + 1)
-        self.convert_next()
+        self.update_header()
+        self._convert_done()
 
     def on_convert_error(self, name: str, error: str):
+        self._convert_done()
         QMessageBox.warning(self, "转换失败", f"{name}: {error}")
-        self.progress_bar.setValue(self.progress_bar.value() + 1)
-        self.convert_next()
 
     def show_context_menu(self, pos):
         item = self.audio_list.itemAt(pos)
@@ -732,9 +1152,17 @@ class VoiceManagerWindow(QMainWindow):
                 QMessageBox.warning(self, "错误", "名称已存在")
                 return
 
-            self.audio_data[new_name] = self.audio_data.pop(old_name)
+            # 保持原有顺序，只替换键名
+            self.audio_data = {
+                new_name if name == old_name else name: value
+                for name, value in self.audio_data.items()
+            }
+            self._invalidate_wav(old_name)
             self.modified = True
-            self.update_ui()
+            self._display_cache.pop(old_name, None)
+            item.setText(self._display_text(new_name))
+            item.setData(Qt.ItemDataRole.UserRole, new_name)
+            self.update_header()
 
     def delete_selected(self):
         items = self.audio_list.selectedItems()
@@ -757,8 +1185,12 @@ class VoiceManagerWindow(QMainWindow):
         if reply == QMessageBox.StandardButton.Yes:
             for name in names:
                 del self.audio_data[name]
+                self._display_cache.pop(name, None)
+                self._invalidate_wav(name)
+            for item in items:
+                self.audio_list.takeItem(self.audio_list.row(item))
             self.modified = True
-            self.update_ui()
+            self.update_header()
             self.status_bar.showMessage(f"已删除 {count} 个音频")
 
     def export_selected(self):
@@ -790,8 +1222,8 @@ class VoiceManagerWindow(QMainWindow):
 
         success = 0
         for name in names:
-            safe_name = re.sub(r'[<>:"/\\|?*]', '', name)[:50]
-            file_path = f"{output_dir}/{safe_name}.mp3"
+            safe_name = name.translate(_SANITIZE_TABLE)[:50]
+            file_path = os.path.join(output_dir, safe_name + '.mp3')
             if self._export_single(name, file_path, show_message=False):
                 success += 1
             self.progress_bar.setValue(self.progress_bar.value() + 1)
@@ -802,21 +1234,15 @@ class VoiceManagerWindow(QMainWindow):
     def _export_single(self, name: str, file_path: str, show_message: bool = True) -> bool:
         """导出单个音频文件"""
         try:
-            audio_bytes = base64.b64decode(self.audio_data[name])
+            audio_bytes = self.audio_data[name]
             ext = Path(file_path).suffix.lower()
 
             if ext == '.silk':
                 with open(file_path, 'wb') as f:
                     f.write(audio_bytes)
             else:
-                if audio_bytes.startswith(b'\x02#!SILK_V3'):
-                    from pydub import AudioSegment
-
-                    wav_path = AudioConverter.silk_to_wav(audio_bytes)
-                    if wav_path:
-                        audio = AudioSegment.from_wav(wav_path)
-                        audio.export(file_path, format=ext[1:])
-                        os.unlink(wav_path)
+                if audio_bytes.startswith(_SILK_MAGIC):
+                    AudioConverter.export_silk(audio_bytes, file_path, ext[1:])
                 else:
                     with open(file_path, 'wb') as f:
                         f.write(audio_bytes)
@@ -838,111 +1264,221 @@ class VoiceManagerWindow(QMainWindow):
         if not output_dir:
             return
 
+        def export_one(file_path: str, audio_bytes: bytes):
+            if audio_bytes.startswith(_SILK_MAGIC):
+                AudioConverter.export_silk(audio_bytes, file_path, 'mp3')
+            else:
+                with open(file_path, 'wb') as f:
+                    f.write(audio_bytes)
+
+        # 先算出目标路径，清理后重名的条目以后者为准，避免两个线程写同一文件
+        jobs = {}
+        skipped = 0
+        for name, audio_bytes in self.audio_data.items():
+            if not isinstance(audio_bytes, bytes):
+                # 整数、字典等非音频条目无法导出，计为失败
+                print(f"导出失败 {name}: 不是音频数据")
+                skipped += 1
+                continue
+            safe_name = name.translate(_SANITIZE_TABLE)[:50]
+            ext = '.mp3' if audio_bytes.startswith(_SILK_MAGIC) else '.audio'
+            file_path = os.path.join(output_dir, safe_name + ext)
+            jobs.pop(file_path, None)
+            jobs[file_path] = (name, audio_bytes)
+
         self.progress_bar.setVisible(True)
-        self.progress_bar.setMaximum(len(self.audio_data))
+        self.progress_bar.setMaximum(len(jobs))
         self.progress_bar.setValue(0)
 
+        # 解码/编码和 ffmpeg 进程在线程池里并行，界面线程只更新进度
         success = 0
-        for name, data in self.audio_data.items():
-            try:
-                audio_bytes = base64.b64decode(data)
-                safe_name = re.sub(r'[<>:"/\\|?*]', '', name)[:50]
-
-                if audio_bytes.startswith(b'\x02#!SILK_V3'):
-                    wav_path = AudioConverter.silk_to_wav(audio_bytes)
-                    if wav_path:
-                        from pydub import AudioSegment
-                        audio = AudioSegment.from_wav(wav_path)
-                        audio.export(f"{output_dir}/{safe_name}.mp3", format='mp3')
-                        os.unlink(wav_path)
-                        success += 1
-                else:
-                    with open(f"{output_dir}/{safe_name}.audio", 'wb') as f:
-                        f.write(audio_bytes)
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as ex:
+            futures = {
+                ex.submit(export_one, file_path, audio_bytes): name
+                for file_path, (name, audio_bytes) in jobs.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
                     success += 1
-            except Exception as e:
-                print(f"导出失败 {name}: {e}")
+                except Exception as e:
+                    print(f"导出失败 {futures[future]}: {e}")
 
-            self.progress_bar.setValue(self.progress_bar.value() + 1)
+                self.progress_bar.setValue(self.progress_bar.value() + 1)
 
         self.progress_bar.setVisible(False)
-        QMessageBox.information(self, "导出完成", f"成功导出 {success}/{len(self.audio_data)} 个音频")
+        QMessageBox.information(self, "导出完成", f"成功导出 {success}/{len(jobs) + skipped} 个音频")
 
     def save_plist(self):
+        if self._save_in_flight:
+            # 保存期间再次保存时不阻塞界面，排队到当前保存完成后执行；连续点击合并为一次
+            self._save_queued = True
+            self.status_bar.showMessage("正在保存...")
+            return
+
         if not self.plist_path:
             self.save_plist_as()
             return
 
-        try:
-            # 检查文件是否只读，如果是则添加写入权限
-            if os.path.exists(self.plist_path):
-                current_mode = os.stat(self.plist_path).st_mode
-                if not (current_mode & 0o200):  # 没有写入权限
-                    os.chmod(self.plist_path, current_mode | 0o200)
+        if not self.modified:
+            self.status_bar.showMessage("无需保存")
+            return
 
-            with open(self.plist_path, 'wb') as f:
-                plistlib.dump(self.audio_data, f)
+        self._write_plist_to(self.plist_path)
 
-            self.modified = False
-            self.update_ui()
+    def _write_plist_to(self, path: str):
+        """在后台把当前数据写入 path，保存和另存为共用"""
+        # 字典浅拷贝即可：值是不可变的 bytes，保存期间可以继续编辑
+        task = PlistSaveTask(path, dict(self.audio_data),
+                             self.plist_fmt, self.legacy_strings)
+        task.signals.finished.connect(self.on_save_finished)
+
+        # 先清除修改标记，保存期间的新编辑会重新设置它
+        self._save_in_flight = True
+        self._saving_path = path
+        self.modified = False
+        self.update_header()
+        self.save_btn.setEnabled(False)
+        self.status_bar.showMessage("正在保存...")
+        self.save_pool.start(task)
+
+    def on_save_finished(self, success: bool, error: str, digest: bytes):
+        self._save_in_flight = False
+        queued, self._save_queued = self._save_queued, False
+        if success:
+            # 另存为成功后才切换到新路径，失败时仍指向原文件
+            self.plist_path = self._saving_path
+            self._last_saved_hash = digest
             self.status_bar.showMessage("保存成功")
-        except PermissionError:
-            QMessageBox.critical(self, "保存失败", "没有写入权限，请检查文件权限或尝试「另存为」")
-        except Exception as e:
-            QMessageBox.critical(self, "保存失败", str(e))
+        else:
+            self.modified = True
+            self.status_bar.showMessage("保存失败")
+            QMessageBox.critical(self, "保存失败", error)
+        # 保存不改变列表内容，只刷新标题和保存按钮
+        self.update_header()
+
+        # 保存期间的新修改，按用户的保存请求接着写入
+        if success and queued and self.modified:
+            self._write_plist_to(self.plist_path)
+
+    def _wait_for_save(self):
+        """等待后台保存结束，并处理它的完成信号"""
+        # 完成信号可能接着启动排队的保存，所以循环等待
+        while self._save_in_flight:
+            self.save_pool.waitForDone()
+            QApplication.sendPostedEvents()
 
     def save_plist_as(self):
+        if self._save_in_flight:
+            self.status_bar.showMessage("正在保存...")
+            return
+
+        # 从当前文件所在目录开始，不解析符号链接、不读取自定义目录图标
         file_path, _ = QFileDialog.getSaveFileName(
-            self, "另存为", "", "Plist 文件 (*.plist)"
+            self, "另存为", os.path.dirname(self.plist_path or ""), "Plist 文件 (*.plist)",
+            options=QFileDialog.Option.DontUseCustomDirectoryIcons |
+                    QFileDialog.Option.DontResolveSymlinks
         )
         if file_path:
-            self.plist_path = file_path
-            self.save_plist()
+            # 另存为即使没有修改也要写出新文件
+            self._write_plist_to(file_path)
 
     def dragEnterEvent(self, event: QDragEnterEvent):
         if event.mimeData().hasUrls():
-            event.acceptProposedAction()
+            event.setDropAction(Qt.DropAction.CopyAction)
+            event.accept()
 
     def dropEvent(self, event: QDropEvent):
-        files = [url.toLocalFile() for url in event.mimeData().urls()]
-        self.on_files_dropped(files)
+        # 只接受本地文件，http 等链接直接丢弃
+        files = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+        if files:
+            # 只复制：接受 Shift 拖动提议的 MoveAction 会让来源删除原文件
+            event.setDropAction(Qt.DropAction.CopyAction)
+            event.accept()
+            self.on_files_dropped(files)
 
-    def closeEvent(self, event):
-        if self.modified:
-            reply = QMessageBox.question(
-                self, "未保存的更改",
-                "有未保存的更改，是否保存？",
+    def _get_unsaved_dialog(self) -> QMessageBox:
+        """「未保存的更改」对话框只创建一次，反复取消关闭时直接复用"""
+        if self._unsaved_dialog is None:
+            dialog = QMessageBox(self)
+            dialog.setIcon(QMessageBox.Icon.Question)
+            dialog.setWindowTitle("未保存的更改")
+            dialog.setText("有未保存的更改，是否保存？")
+            dialog.setStandardButtons(
                 QMessageBox.StandardButton.Save |
                 QMessageBox.StandardButton.Discard |
                 QMessageBox.StandardButton.Cancel
             )
+            dialog.setDefaultButton(QMessageBox.StandardButton.Save)
+            self._unsaved_dialog = dialog
+        return self._unsaved_dialog
+
+    def closeEvent(self, event):
+        self._wait_for_save()
+
+        # 改过又改回 (如重命名后再改回原名) 时内容与文件一致，不必询问
+        if self.modified and self._last_saved_hash is not None and \
+                content_digest(self.audio_data) == self._last_saved_hash:
+            self.modified = False
+
+        if self.modified:
+            dialog = self._get_unsaved_dialog()
+            dialog.exec()
+            reply = dialog.standardButton(dialog.clickedButton())
 
             if reply == QMessageBox.StandardButton.Save:
                 self.save_plist()
+                self._wait_for_save()
+                if self.modified:
+                    # 保存失败或被取消，不关闭窗口以免丢失数据
+                    event.ignore()
+                    return
             elif reply == QMessageBox.StandardButton.Cancel:
                 event.ignore()
                 return
 
-        # 清理临时文件
-        for f in self.temp_files:
+        # 先让播放器释放正在播放的 WAV (Windows 上打开的文件删不掉)
+        self.player.stop()
+        self.player.setSource(QUrl())
+        self._play_buffer = None
+
+        # 临时文件都在 _SCRATCH 目录中，整体删除即可；没有解码过音频时目录为空，跳过
+        self._wav_cache.clear()
+        if self.leave_temps:
+            print(f"临时文件保留在: {_SCRATCH}")
+        else:
             try:
-                os.unlink(f)
-            except:
-                pass
+                with os.scandir(_SCRATCH) as it:
+                    has_temps = next(it, None) is not None
+            except OSError:
+                has_temps = False
+            if has_temps:
+                shutil.rmtree(_SCRATCH, ignore_errors=True)
 
         event.accept()
 
 
 def main():
+    # 必须在创建 QApplication 之前设置；Qt6 已默认开启高 DPI 缩放和高 DPI 图标
+    QApplication.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts, True)
+    # 在创建 QApplication 前设置样式，避免先加载平台默认样式再整体重新 polish
+    QApplication.setStyle(QStyleFactory.create('Fusion'))
     app = QApplication(sys.argv)
-    app.setStyle('Fusion')
+
+    args = sys.argv[1:]
+    leave_temps = '--leave-temps' in args
+    if leave_temps:
+        args = [a for a in args if a != '--leave-temps']
+        atexit.unregister(shutil.rmtree)
 
     window = VoiceManagerWindow()
+    window.leave_temps = leave_temps
     window.show()
 
-    # 如果命令行传入了文件路径，直接加载
-    if len(sys.argv) > 1:
-        window.load_plist(sys.argv[1])
+    # 如果命令行传入了文件路径，窗口显示后在后台加载
+    if args:
+        QTimer.singleShot(0, functools.partial(window.load_plist_async, args[0]))
 
     sys.exit(app.exec())
 
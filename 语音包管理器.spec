@@ -1,11 +1,11 @@
 # -*- mode: python ; coding: utf-8 -*-
-from PyInstaller.utils.hooks import collect_all
+from PyInstaller.utils.hooks import collect_dynamic_libs, collect_submodules
 
 datas = []
 binaries = [('/opt/homebrew/bin/ffmpeg', './'), ('/opt/homebrew/bin/ffprobe', './')]
-hiddenimports = ['pilk', 'pilk._pilk', 'pilk.SilkDecoder', 'pilk.SilkEncoder', 'pydub', 'pydub.utils', 'pydub.audio_segment', 'PyQt6', 'PyQt6.QtCore', 'PyQt6.QtGui', 'PyQt6.QtWidgets', 'PyQt6.QtMultimedia']
-tmp_ret = collect_all('pilk')
-datas += tmp_ret[0]; binaries += tmp_ret[1]; hiddenimports += tmp_ret[2]
+hiddenimports = ['pysilk', 'pysilk.backends.cython', 'pysilk.backends.cython._silk', 'pydub', 'pydub.utils', 'pydub.audio_segment', 'PyQt6', 'PyQt6.QtCore', 'PyQt6.QtGui', 'PyQt6.QtWidgets', 'PyQt6.QtMultimedia']
+binaries += collect_dynamic_libs('pysilk')
+hiddenimports += collect_submodules('pysilk')
 
 
 a = Analysis(
@@ -17,7 +17,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['PyQt6.QtQml', 'PyQt6.QtQuick', 'PyQt6.QtWebEngineCore'],
     noarchive=False,
     optimize=0,
 )
@@ -2,7 +2,7 @@
 # Windows 打包配置文件
 # 使用方法: pyinstaller 语音包管理器_windows.spec --noconfirm
 
-from PyInstaller.utils.hooks import collect_all
+from PyInstaller.utils.hooks import collect_dynamic_libs, collect_submodules
 import os
 
 # 获取 ffmpeg 路径 (Windows 常见位置)
@@ -43,16 +43,14 @@ if ffprobe_exe:
     print(f"找到 ffprobe: {ffprobe_exe}")
 
 hiddenimports = [
-    'pilk', 'pilk._pilk', 'pilk.SilkDecoder', 'pilk.SilkEncoder',
+    'pysilk', 'pysilk.backends.cython', 'pysilk.backends.cython._silk',
     'pydub', 'pydub.utils', 'pydub.audio_segment',
     'PyQt6', 'PyQt6.QtCore', 'PyQt6.QtGui', 'PyQt6.QtWidgets', 'PyQt6.QtMultimedia'
 ]
 
-# 收集 pilk 的所有文件
-tmp_ret = collect_all('pilk')
-datas += tmp_ret[0]
-binaries += tmp_ret[1]
-hiddenimports += tmp_ret[2]
+# 只收集 pysilk 的二进制扩展和子模块
+binaries += collect_dynamic_libs('pysilk')
+hiddenimports += collect_submodules('pysilk')
 
 a = Analysis(
     ['voice_manager.py'],
@@ -63,7 +61,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['PyQt6.QtQml', 'PyQt6.QtQuick', 'PyQt6.QtWebEngineCore'],
     noarchive=False,
     optimize=0,
 )
@@ -95,6 +93,8 @@ coll = COLLECT(
     a.datas,
     strip=False,
     upx=True,
-    upx_exclude=[],
+    # Qt 的 DLL 经 UPX 压缩后会破坏签名
+    upx_exclude=['Qt6Core.dll', 'Qt6Gui.dll', 'Qt6Widgets.dll', 'Qt6Network.dll',
+                 'Qt6Multimedia.dll', 'qwindows.dll'],
     name='语音包管理器',
 )